@@ -14,7 +14,7 @@ GDB Python 脚本: 自动提取微信 WCDB 加密密钥
 """
 
 import gdb
-import re
+import struct
 import sys
 import os
 
@@ -28,18 +28,34 @@ sys.stdout = sys.stderr
 # WeChat 4.1.0.16 的 setCipherKey 偏移
 SETCIPHERKEY_OFFSET = 0x6586C90
 
+# WCDB Data 结构体布局: [vtable/type(8), void* data(8), size_t size(8)]
+DATA_PTR_OFFSET = 8
+DATA_SIZE_OFFSET = 16
+DATA_STRUCT_SIZE = 24
+
+# WCDB 密钥长度 (字节)
+KEY_SIZE = 32
+
+# 预编译 u64 小端解包 (断点回调中复用)
+_U64 = struct.Struct("<Q")
+
 # 密钥保存路径
 KEY_FILE = "/tmp/wechat_key.txt"
 
 # 微信二进制路径 (容器内)
 WECHAT_BINARY = "/opt/wechat/wechat"
 
+# 调试输出 (EXTRACT_KEY_DEBUG 非空且不为 "0" 时在断点回调中打印命中详情)
+# 断点回调期间微信处于暂停状态, 默认只输出结果, 缩短暂停时间
+# 宽松解析: 任何取值都不能让脚本在设置断点前异常退出
+DEBUG = os.environ.get("EXTRACT_KEY_DEBUG", "").strip() not in ("", "0")
+
 # =====================================================================
 # GDB 初始化
 # =====================================================================
 
-gdb.execute("set pagination off")
-gdb.execute("set confirm off")
+# 合并为一次命令分发 (GDB 接受换行分隔的多条命令)
+gdb.execute("set pagination off\nset confirm off")
 
 print("[extract_key] 🔑 GDB 密钥提取脚本启动")
 
@@ -48,34 +64,48 @@ print("[extract_key] 🔑 GDB 密钥提取脚本启动")
 # =====================================================================
 
 def get_wechat_base():
-    """从 /proc/pid/maps 或 info proc mapping 获取微信基地址"""
+    """从 /proc/pid/maps (回退: info proc mapping) 获取微信基地址"""
+    # 直接在 bytes 上 find 二进制路径, 不做逐行解码; 找到第一个可执行段即返回
+    # procfs 每次 read() 只返回完整行 (约一页), 因此逐块扫描即可, 无需拼接
+    # 注: /proc/pid/map_files/ 只给出 "start-end" 和目标文件, 不含段权限,
+    # 无法区分 r--p / r-xp, 因此这里仍以 maps 为准
     try:
-        output = gdb.execute("info proc mapping", to_string=True)
-        for line in output.splitlines():
-            line = line.strip()
-            if WECHAT_BINARY in line and "r-x" in line:
-                # 找到代码段 (可执行)
-                addr = line.split()[0]
-                return int(addr, 16)
-            elif WECHAT_BINARY in line:
-                addr = line.split()[0]
-                return int(addr, 16)
+        pid = gdb.selected_inferior().pid
+        binary = WECHAT_BINARY.encode()
+        fd = os.open(f"/proc/{pid}/maps", os.O_RDONLY)
+        try:
+            while True:
+                buf = os.read(fd, 1 << 20)
+                if not buf:
+                    break
+                pos = buf.find(binary)
+                while pos != -1:
+                    ls = buf.rfind(b"\n", 0, pos) + 1
+                    le = buf.find(b"\n", pos)
+                    if le == -1:
+                        le = len(buf)
+                    line = buf[ls:le]
+                    if b"r-xp" in line:
+                        return int(line[:line.index(b"-")], 16)
+                    pos = buf.find(binary, le)
+        finally:
+            os.close(fd)
+        # maps 已完整读取但没有可执行段: 不必再扫一遍 info proc mapping
+        return None
     except Exception as e:
-        print(f"[extract_key] ❌ info proc mapping 失败: {e}")
+        print(f"[extract_key] ❌ /proc/maps 读取失败: {e}")
 
-    # 回退: 从 /proc/pid/maps 读取
+    # 回退: info proc mapping (仅在 /proc 不可读时)
     try:
-        pid = gdb.selected_inferior().pid
-        with open(f"/proc/{pid}/maps", "r") as f:
-            for line in f:
-                if WECHAT_BINARY in line and "r-xp" in line:
-                    addr = line.split("-")[0]
-                    return int(addr, 16)
-                elif WECHAT_BINARY in line:
-                    addr = line.split("-")[0]
-                    return int(addr, 16)
+        output = gdb.execute("info proc mapping", to_string=True)
+        for line in output.splitlines():
+            # 只接受代码段 (可执行); r--p 等段的起始地址不是断点偏移的基准
+            if WECHAT_BINARY not in line or "r-xp" not in line:
+                continue
+            addr = line.split()[0]
+            return int(addr, 16)
     except Exception as e:
-        print(f"[extract_key] ❌ /proc/maps 读取失败: {e}")
+        print(f"[extract_key] ❌ info proc mapping 失败: {e}")
 
     return None
 
@@ -102,78 +132,76 @@ class SetCipherKeyBreakpoint(gdb.Breakpoint):
         super().__init__(f"*{hex(addr)}", gdb.BP_BREAKPOINT)
         self._hits = 0
         self.captured_key = None
+        # 绑定一次, 避免每次命中重复属性查找
+        self._read_memory = gdb.selected_inferior().read_memory
 
     def stop(self):
-        """断点触发回调. 返回 False = 不停止, 继续运行"""
+        """断点触发回调. 返回 False = 不停止, 继续运行; True = 已捕获密钥, 停下"""
         self._hits += 1
 
         try:
-            # 读取寄存器
-            rsi = int(gdb.parse_and_eval("$rsi"))
-            rdx = int(gdb.parse_and_eval("$rdx"))
-            ecx = int(gdb.parse_and_eval("$ecx"))
-
-            print(f"[extract_key] 🔑 [{self._hits}] HIT! page_size={rdx}, cipher_version={ecx}")
-
-            # Data 结构体布局: [vtable/type(8), void* data(8), size_t size(8)]
-            raw_ptr = gdb.execute(f"x/1gx {rsi + 8}", to_string=True)
-            ptr = int(raw_ptr.split(":")[1].strip().split()[0], 16)
-
-            raw_sz = gdb.execute(f"x/1gx {rsi + 16}", to_string=True)
-            sz = int(raw_sz.split(":")[1].strip().split()[0], 16)
-
-            if 0 < sz <= 256 and ptr > 0x1000:
+            # 读取寄存器 (read_register 直接取值, 不经过表达式解析器)
+            frame = gdb.selected_frame()
+            rsi = int(frame.read_register("rsi"))
+            if DEBUG:
+                rdx = int(frame.read_register("rdx"))
+                ecx = int(frame.read_register("ecx"))
+                sys.stderr.write(f"[extract_key] 🔑 [{self._hits}] HIT! page_size={rdx}, cipher_version={ecx}\n")
+
+            # 一次读取整个 Data 结构体, 避免 x/Ngx 格式化输出 + 文本解析
+            data = self._read_memory(rsi, DATA_STRUCT_SIZE).tobytes()
+            if DEBUG:
+                # 结构体原始字节, 用于核对布局 (复用已读取的数据, 不额外读内存)
+                sys.stderr.write(f"[extract_key] 🔍 [{self._hits}] Data@{hex(rsi)}: {data.hex()}\n")
+            (ptr,) = _U64.unpack_from(data, DATA_PTR_OFFSET)
+            (sz,) = _U64.unpack_from(data, DATA_SIZE_OFFSET)
+
+            # 只接受 32 字节密钥; 其他大小的 setCipherKey 调用直接放行
+            if sz == KEY_SIZE and ptr > 0x1000:
                 # 读取密钥字节
-                # 重要: 逐行解析 GDB x/Nbx 输出, 只取冒号后面的数据
-                # 避免把地址中的 0xNN 也当成数据
-                raw_bytes = gdb.execute(f"x/{sz}bx {ptr}", to_string=True)
-                hex_values = []
-                for line in raw_bytes.strip().splitlines():
-                    # 每行格式: "0x76d6f0003ba0:\t0x39\t0xa1\t..."
-                    # 取冒号后面的部分
-                    if ":" in line:
-                        data_part = line.split(":", 1)[1]
-                    else:
-                        data_part = line
-                    hex_values.extend(re.findall(r"0x([0-9a-fA-F]{2})", data_part))
-
-                key_hex = "".join(hex_values)
-                print(f"[extract_key] 🔑 [{self._hits}] 密钥({sz}字节): {key_hex}")
+                key_hex = self._read_memory(ptr, sz).tobytes().hex()
+                if DEBUG:
+                    sys.stderr.write(f"[extract_key] 🔑 [{self._hits}] 密钥({sz}字节): {key_hex}\n")
 
                 # 只保存第一次捕获的密钥
                 if self.captured_key is None:
                     self.captured_key = key_hex
                     try:
-                        with open(KEY_FILE, "w") as f:
-                            f.write(key_hex)
-                        print(f"[extract_key] ✅ 密钥已保存到 {KEY_FILE}")
+                        # 0o644: GDB 以 root 运行, MimicWX 以 wechat 用户读取
+                        fd = os.open(KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                        try:
+                            os.write(fd, key_hex.encode())
+                        finally:
+                            os.close(fd)
+                        sys.stderr.write(f"[extract_key] ✅ 密钥已保存到 {KEY_FILE}\n")
                     except Exception as e:
-                        print(f"[extract_key] ❌ 保存密钥失败: {e}")
+                        sys.stderr.write(f"[extract_key] ❌ 保存密钥失败: {e}\n")
 
-                    # 首次捕获后, 删除断点并计划 detach
-                    gdb.post_event(self._cleanup)
-            else:
-                print(f"[extract_key] ⚠️ [{self._hits}] 异常: ptr={hex(ptr)} size={sz}")
+                    # 首次捕获后停下, 让 continue 返回, 由顶层立即 detach
+                    return True
+            elif DEBUG:
+                sys.stderr.write(f"[extract_key] ⚠️ [{self._hits}] 异常: ptr={hex(ptr)} size={sz}\n")
 
         except Exception as e:
-            print(f"[extract_key] ❌ 提取失败: {e}")
+            sys.stderr.write(f"[extract_key] ❌ 提取失败: {e}\n")
 
         return False  # 不停止, 让微信继续运行
 
-    def _cleanup(self):
-        """清理断点并 detach"""
+
+def detach_and_quit():
+    """清理断点并 detach"""
+    try:
+        print("[extract_key] 🔓 正在 detach...")
+        gdb.execute("delete breakpoints")
+        gdb.execute("detach")
+        print("[extract_key] ✅ GDB 已 detach, 微信正常运行")
+        gdb.execute("quit")
+    except Exception as e:
+        print(f"[extract_key] ⚠️ detach 过程异常: {e}")
         try:
-            print("[extract_key] 🔓 密钥已获取, 正在 detach...")
-            gdb.execute("delete breakpoints")
-            gdb.execute("detach")
-            print("[extract_key] ✅ GDB 已 detach, 微信正常运行")
             gdb.execute("quit")
-        except Exception as e:
-            print(f"[extract_key] ⚠️ detach 过程异常: {e}")
-            try:
-                gdb.execute("quit")
-            except:
-                pass
+        except:
+            pass
 
 
 # =====================================================================
@@ -184,5 +212,10 @@ bp = SetCipherKeyBreakpoint(bp_addr)
 print(f"[extract_key] ⏳ 断点已设置, 等待用户扫码登录...")
 print(f"[extract_key] 📱 请通过 noVNC (http://localhost:6080/vnc.html) 扫码登录微信")
 
-# 继续执行 — GDB 将在此阻塞直到断点触发或进程退出
+# 继续执行 — GDB 将在此阻塞直到捕获密钥 (stop 返回 True) 或进程退出
 gdb.execute("continue")
+
+# 微信此时停在 setCipherKey 入口, 立即 detach, 缩短其处于 ptrace 下的时间
+if bp.captured_key is None:
+    print("[extract_key] ⚠️ 未捕获密钥 (微信可能已退出)")
+detach_and_quit()
@@ -350,6 +350,39 @@ impl AtSpi {
         Some(NodeRef { bus, path })
     }
 
+    /// 取前 `limit` 个子节点引用
+    ///
+    /// 子节点数不超过 `limit` 时用一次 GetChildren 取回全部, 比 N 次
+    /// GetChildAtIndex 少 N-1 次 D-Bus 往返。超过时 GetChildren 会让 Qt
+    /// 为每一行创建 accessible 并全部返回 (长消息列表可能超时), 因此改为
+    /// 只逐个获取前 `limit` 个; GetChildren 失败时同样回退到逐个获取。
+    pub async fn children(&self, node: &NodeRef, limit: i32) -> Vec<NodeRef> {
+        let count = self.child_count(node).await;
+        if 0 < count && count <= limit {
+            let reply = self.call(
+                &node.bus, node.path.as_str(),
+                Some(IFACE_ACCESSIBLE), "GetChildren", &(),
+            ).await;
+            let batch = reply.and_then(|r| {
+                r.body().deserialize::<Vec<(String, OwnedObjectPath)>>().ok()
+            });
+            if let Some(list) = batch {
+                return list.into_iter()
+                    .take(limit.max(0) as usize)
+                    .map(|(bus, path)| NodeRef { bus, path })
+                    .collect();
+            }
+        }
+
+        let mut out = Vec::new();
+        for i in 0..count.min(limit) {
+            if let Some(child) = self.child_at(node, i).await {
+                out.push(child);
+            }
+        }
+        out
+    }
+
     pub async fn name(&self, node: &NodeRef) -> String {
         let reply = self.call(
             &node.bus, node.path.as_str(), Some(PROPS), "Get",
@@ -370,6 +403,11 @@ impl AtSpi {
             .unwrap_or_default()
     }
 
+    /// 并发读取 role + name (两次 D-Bus 调用同时在途, 搜索时每个节点省一次往返等待)
+    pub async fn role_and_name(&self, node: &NodeRef) -> (String, String) {
+        tokio::join!(self.role(node), self.name(node))
+    }
+
     pub async fn bbox(&self, node: &NodeRef) -> Option<BBox> {
         let reply = self.call(
             &node.bus, node.path.as_str(),
@@ -379,6 +417,10 @@ impl AtSpi {
         Some(BBox { x, y, w, h })
     }
 
+    /// 读取 Text 接口全文
+    ///
+    /// 不预先用 GetInterfaces 探测: 不支持 Text 的节点直接返回 D-Bus 错误,
+    /// 同样只需一次往返, 而支持的节点省掉一次探测调用。
     pub async fn text(&self, node: &NodeRef) -> Option<String> {
         let reply = self.call(
             &node.bus, node.path.as_str(),
@@ -479,8 +521,7 @@ impl AtSpi {
                     visited += 1;
                     if visited > max_nodes { return None; }
                     if let Some(child) = self.child_at(node, i).await {
-                        let role = self.role(&child).await;
-                        let name = self.name(&child).await;
+                        let (role, name) = self.role_and_name(&child).await;
                         if matcher(&role, &name) {
                             return Some(child);
                         }
@@ -495,40 +536,107 @@ impl AtSpi {
         None
     }
 
-    /// DFS 查找节点 (递归, 可控制跳过/递归/匹配)
+    /// DFS 查找节点 (显式栈, 可控制跳过/递归/匹配)
     ///
     /// `matcher(role, name) -> SearchAction`:
     /// - `Found` = 匹配, 返回此节点
     /// - `Recurse` = 不匹配, 但继续递归子节点
     /// - `Skip` = 不匹配, 跳过此子树
-    pub fn find_dfs<'a>(
-        &'a self, node: &'a NodeRef,
-        matcher: &'a (dyn Fn(&str, &str) -> SearchAction + Send + Sync),
+    ///
+    /// 访问顺序与递归版本一致: 子节点按索引依次处理, 命中 `Recurse`
+    /// 时先深入其子树, 再回到下一个兄弟节点。
+    pub async fn find_dfs(
+        &self, root: &NodeRef,
+        matcher: &(dyn Fn(&str, &str) -> SearchAction + Send + Sync),
         depth: u32, max_depth: u32, max_children: i32,
-    ) -> std::pin::Pin<Box<dyn std::future::Future<Output = Option<NodeRef>> + Send + 'a>> {
-        Box::pin(async move {
-            if depth > max_depth { return None; }
-
-            let count = self.child_count(node).await;
-            for i in 0..count.min(max_children) {
-                if let Some(child) = self.child_at(node, i).await {
-                    let role = self.role(&child).await;
-                    let name = self.name(&child).await;
-                    match matcher(&role, &name) {
-                        SearchAction::Found => return Some(child),
-                        SearchAction::Recurse => {
-                            if let Some(found) = self.find_dfs(
-                                &child, matcher, depth + 1, max_depth, max_children,
-                            ).await {
-                                return Some(found);
-                            }
-                        }
-                        SearchAction::Skip => {}
+    ) -> Option<NodeRef> {
+        if depth > max_depth { return None; }
+
+        let count = self.child_count(root).await;
+        let mut stack = vec![WalkFrame::new(root.clone(), depth, count.min(max_children))];
+
+        while let Some(frame) = stack.last_mut() {
+            let Some(idx) = frame.advance() else {
+                stack.pop();
+                continue;
+            };
+            let node_depth = frame.depth;
+
+            let Some(child) = self.child_at(&frame.node, idx).await else { continue };
+            let (role, name) = self.role_and_name(&child).await;
+            match matcher(&role, &name) {
+                SearchAction::Found => return Some(child),
+                SearchAction::Recurse => {
+                    if node_depth < max_depth {
+                        let count = self.child_count(&child).await;
+                        stack.push(WalkFrame::new(child, node_depth + 1, count.min(max_children)));
                     }
                 }
+                SearchAction::Skip => {}
             }
-            None
-        })
+        }
+        None
+    }
+
+    /// 多目标 DFS: 一次遍历同时查找多个节点
+    ///
+    /// 每个 matcher 的语义与 [`find_dfs`](Self::find_dfs) 相同: 只在该 matcher
+    /// 返回 `Recurse` 的子树中继续为它查找, 结果等价于逐个调用 find_dfs,
+    /// 但共享 child_count / child_at / role / name 的 D-Bus 调用。
+    /// 全部命中后提前结束。返回值与 `matchers` 一一对应。
+    pub async fn find_dfs_many(
+        &self, root: &NodeRef,
+        matchers: &[&(dyn Fn(&str, &str) -> SearchAction + Send + Sync)],
+        max_depth: u32, max_children: i32,
+    ) -> Vec<Option<NodeRef>> {
+        debug_assert!(matchers.len() <= 32);
+        if matchers.is_empty() { return Vec::new(); }
+        let mut found: Vec<Option<NodeRef>> = vec![None; matchers.len()];
+        let all = u32::MAX >> (32 - matchers.len());
+        let mut pending = all;
+
+        let count = self.child_count(root).await;
+        let mut stack = vec![WalkFrame {
+            mask: all,
+            ..WalkFrame::new(root.clone(), 0, count.min(max_children))
+        }];
+
+        while let Some(frame) = stack.last_mut() {
+            if pending == 0 { break; }
+            // 此子树中要找的目标都已命中, 整个子树不必再遍历
+            let idx = match frame.advance() {
+                Some(idx) if frame.mask & pending != 0 => idx,
+                _ => {
+                    stack.pop();
+                    continue;
+                }
+            };
+            let (node_depth, mask) = (frame.depth, frame.mask);
+
+            let Some(child) = self.child_at(&frame.node, idx).await else { continue };
+            let (role, name) = self.role_and_name(&child).await;
+            let mut child_mask = 0u32;
+            for (i, matcher) in matchers.iter().enumerate() {
+                let bit = 1u32 << i;
+                if mask & pending & bit == 0 { continue; }
+                match matcher(&role, &name) {
+                    SearchAction::Found => {
+                        found[i] = Some(child.clone());
+                        pending &= !bit;
+                    }
+                    SearchAction::Recurse => child_mask |= bit,
+                    SearchAction::Skip => {}
+                }
+            }
+            if child_mask & pending != 0 && node_depth < max_depth {
+                let count = self.child_count(&child).await;
+                stack.push(WalkFrame {
+                    mask: child_mask,
+                    ..WalkFrame::new(child, node_depth + 1, count.min(max_children))
+                });
+            }
+        }
+        found
     }
 
     // =================================================================
@@ -536,39 +644,46 @@ impl AtSpi {
     // =================================================================
 
     /// 导出 AT-SPI2 树（调试用，限制 200 节点）
+    ///
+    /// 先序遍历, 用显式栈代替递归; 输出顺序与递归版本一致。
     pub async fn dump_tree(&self, root: &NodeRef, max_depth: u32) -> Vec<TreeNode> {
         let mut nodes = Vec::new();
-        let mut count = 0u32;
-        self.dump_dfs(root, 0, max_depth, &mut nodes, &mut count).await;
-        nodes
-    }
-
-    fn dump_dfs<'a>(
-        &'a self, node: &'a NodeRef, depth: u32, max_depth: u32,
-        out: &'a mut Vec<TreeNode>, count: &'a mut u32,
-    ) -> std::pin::Pin<Box<dyn std::future::Future<Output = ()> + Send + 'a>> {
-        Box::pin(async move {
-            if depth > max_depth || *count >= 200 { return; }
-            *count += 1;
-
-            let role = self.role(node).await;
-            let name = self.name(node).await;
-            let children = self.child_count(node).await;
+        let mut stack = Vec::new();
+        if let Some(n) = self.dump_visit(root, 0, max_depth, &mut nodes).await {
+            stack.push(WalkFrame::new(root.clone(), 0, n));
+        }
 
-            out.push(TreeNode { depth, role: role.clone(), name: name.clone(), children });
+        while let Some(frame) = stack.last_mut() {
+            if nodes.len() >= 200 { break; }
+            let Some(idx) = frame.advance() else {
+                stack.pop();
+                continue;
+            };
+            let depth = frame.depth + 1;
 
-            // 消息列表不递归
-            if role == "list" && (name.contains("消息") || name.contains("Messages")) {
-                return;
+            let Some(child) = self.child_at(&frame.node, idx).await else { continue };
+            if let Some(n) = self.dump_visit(&child, depth, max_depth, &mut nodes).await {
+                stack.push(WalkFrame::new(child, depth, n));
             }
+        }
+        nodes
+    }
 
-            for i in 0..children.min(20) {
-                if *count >= 200 { return; }
-                if let Some(child) = self.child_at(node, i).await {
-                    self.dump_dfs(&child, depth + 1, max_depth, out, count).await;
-                }
-            }
-        })
+    /// 记录单个节点, 返回需要继续展开的子节点数 (None = 不展开)
+    async fn dump_visit(
+        &self, node: &NodeRef, depth: u32, max_depth: u32, out: &mut Vec<TreeNode>,
+    ) -> Option<i32> {
+        if depth > max_depth || out.len() >= 200 { return None; }
+
+        let (role, name, children) = tokio::join!(
+            self.role(node), self.name(node), self.child_count(node),
+        );
+        // 消息列表不递归; 已到最大深度时也不再取子节点引用
+        let expand = depth < max_depth
+            && !(role == "list" && (name.contains("消息") || name.contains("Messages")));
+        out.push(TreeNode { depth, role, name, children });
+
+        expand.then(|| children.min(20))
     }
 
     // =================================================================
@@ -606,6 +721,31 @@ pub enum SearchAction {
     Skip,
 }
 
+/// 显式栈遍历的栈帧 (find_dfs / find_dfs_many / dump_tree 共用)
+struct WalkFrame {
+    node: NodeRef,
+    depth: u32,
+    /// find_dfs_many: 仍在此子树中查找的 matcher 位掩码 (其他遍历不使用)
+    mask: u32,
+    /// 待遍历子节点数
+    count: i32,
+    /// 下一个子节点索引
+    next: i32,
+}
+
+impl WalkFrame {
+    fn new(node: NodeRef, depth: u32, count: i32) -> Self {
+        Self { node, depth, mask: 0, count, next: 0 }
+    }
+
+    /// 取出下一个待遍历的子节点索引; 已遍历完返回 None
+    fn advance(&mut self) -> Option<i32> {
+        if self.next >= self.count { return None; }
+        self.next += 1;
+        Some(self.next - 1)
+    }
+}
+
 /// 结构性角色: BFS 搜索时应当穿透的容器节点
 /// 统一定义, 避免多处硬编码不一致
 pub fn is_structural_role(role: &str) -> bool {
@@ -71,15 +71,15 @@ impl ChatWnd {
         }
     }
 
-    /// 初始化输入框缓存 (DFS 搜索, 只跑一次)
+    /// 初始化输入框 + 消息列表缓存 (一次 DFS 同时查找, 只跑一次)
     ///
-    /// 不限制结构性角色, 遍历所有子节点找 `entry`/`text`
-    pub async fn init_edit_box(&mut self) {
-        if self.edit_box_node.is_some() {
+    /// 输入框: 不限制结构性角色, 遍历所有子节点找 `entry`/`text` (跳过 list)
+    /// 消息列表: 查找 name 含 "消息"/"Messages" 的 list (跳过其他 list)
+    pub async fn init_nodes(&mut self) {
+        if self.edit_box_node.is_some() && self.msg_list_node.is_some() {
             return; // 已缓存
         }
-        let win = self.window_node.clone();
-        if let Some(node) = self.atspi.find_dfs(&win, &|role, _| {
+        let edit_matcher = |role: &str, _: &str| {
             if role == "entry" || role == "text" {
                 SearchAction::Found
             } else if role == "list" {
@@ -87,21 +87,8 @@ impl ChatWnd {
             } else {
                 SearchAction::Recurse
             }
-        }, 0, 15, 30).await {
-            info!("📌 [ChatWnd] 缓存输入框节点: {}", self.who);
-            self.edit_box_node = Some(node);
-        } else {
-            info!("📌 [ChatWnd] 未找到输入框, 将使用偏移量方案: {}", self.who);
-        }
-    }
-
-    /// 初始化消息列表缓存 (DFS 搜索, 只跑一次)
-    pub async fn init_msg_list(&mut self) {
-        if self.msg_list_node.is_some() {
-            return;
-        }
-        let win = self.window_node.clone();
-        if let Some(node) = self.atspi.find_dfs(&win, &|role, name| {
+        };
+        let list_matcher = |role: &str, name: &str| {
             if role == "list" && (name.contains("消息") || name.contains("Messages") || name.contains("Message")) {
                 SearchAction::Found
             } else if role == "list" {
@@ -109,11 +96,28 @@ impl ChatWnd {
             } else {
                 SearchAction::Recurse
             }
-        }, 0, 15, 30).await {
-            info!("📌 [ChatWnd] 缓存消息列表节点: {}", self.who);
-            self.msg_list_node = Some(node);
-        } else {
-            info!("📌 [ChatWnd] 未找到消息列表: {}", self.who);
+        };
+        let win = self.window_node.clone();
+        let mut found = self.atspi.find_dfs_many(
+            &win, &[&edit_matcher, &list_matcher], 15, 30,
+        ).await.into_iter();
+        let (edit_box, msg_list) = (found.next().flatten(), found.next().flatten());
+
+        if self.edit_box_node.is_none() {
+            if let Some(node) = edit_box {
+                info!("📌 [ChatWnd] 缓存输入框节点: {}", self.who);
+                self.edit_box_node = Some(node);
+            } else {
+                info!("📌 [ChatWnd] 未找到输入框, 将使用偏移量方案: {}", self.who);
+            }
+        }
+        if self.msg_list_node.is_none() {
+            if let Some(node) = msg_list {
+                info!("📌 [ChatWnd] 缓存消息列表节点: {}", self.who);
+                self.msg_list_node = Some(node);
+            } else {
+                info!("📌 [ChatWnd] 未找到消息列表: {}", self.who);
+            }
         }
     }
 
@@ -154,14 +158,11 @@ impl ChatWnd {
             }
         };
 
-        let count = self.atspi.child_count(&msg_list).await;
         let mut messages = Vec::new();
 
-        for i in 0..count.min(100) {
-            if let Some(child) = self.atspi.child_at(&msg_list, i).await {
-                let msg = self.parse_message_item(&child, i).await;
-                messages.push(msg);
-            }
+        for (i, child) in self.atspi.children(&msg_list, 100).await.iter().enumerate() {
+            let msg = self.parse_message_item(child, i as i32).await;
+            messages.push(msg);
         }
 
         messages
@@ -262,17 +262,14 @@ impl WeChat {
             None => return Vec::new(),
         };
 
-        let count = self.atspi.child_count(&list).await;
         let mut sessions = Vec::new();
 
-        for i in 0..count.min(50) {
-            if let Some(child) = self.atspi.child_at(&list, i).await {
-                let name = self.atspi.name(&child).await;
-                let trimmed = name.trim().to_string();
-                if trimmed.len() > 1 {
-                    let has_new = self.check_session_has_new(&child).await;
-                    sessions.push(SessionInfo { name: trimmed, has_new });
-                }
+        for child in self.atspi.children(&list, 50).await {
+            let name = self.atspi.name(&child).await;
+            let trimmed = name.trim().to_string();
+            if trimmed.len() > 1 {
+                let has_new = self.check_session_has_new(&child).await;
+                sessions.push(SessionInfo { name: trimmed, has_new });
             }
         }
 
@@ -451,8 +448,7 @@ impl WeChat {
         if let Some(wnd_node) = self.find_chat_window(&app, who).await {
             let mut windows = self.listen_windows.lock().await;
             let mut chatwnd = ChatWnd::new(who.to_string(), self.atspi.clone(), wnd_node);
-            chatwnd.init_edit_box().await;
-            chatwnd.init_msg_list().await;
+            chatwnd.init_nodes().await;
             windows.insert(who.to_string(), chatwnd);
             info!("👂 找到现有独立窗口, 已注册: {who}");
             return Ok(true);
@@ -483,8 +479,7 @@ impl WeChat {
             tokio::time::sleep(ms(1500)).await;
             if let Some(wnd_node) = self.find_chat_window(&app, who).await {
                 let mut chatwnd = ChatWnd::new(who.to_string(), self.atspi.clone(), wnd_node);
-                chatwnd.init_edit_box().await;
-                chatwnd.init_msg_list().await;
+                chatwnd.init_nodes().await;
                 chatwnd.mark_all_read().await;
                 let mut windows = self.listen_windows.lock().await;
                 windows.insert(who.to_string(), chatwnd);
@@ -628,14 +623,11 @@ impl WeChat {
 
     /// 读取消息列表中的所有消息项 (增强版: 带分类)
     async fn read_message_list(&self, msg_list: &NodeRef) -> Vec<ChatMessage> {
-        let count = self.atspi.child_count(msg_list).await;
         let mut messages = Vec::new();
 
-        for i in 0..count.min(100) {
-            if let Some(child) = self.atspi.child_at(msg_list, i).await {
-                let msg = self.parse_message_item(&child, i).await;
-                messages.push(msg);
-            }
+        for (i, child) in self.atspi.children(msg_list, 100).await.iter().enumerate() {
+            let msg = self.parse_message_item(child, i as i32).await;
+            messages.push(msg);
         }
 
         messages